@@ -1,25 +1,55 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
+import xgboost as xgb
 import joblib
 import os
 
 # Load model and feature columns
-MODEL_PATH = "model.pkl"
+MODEL_PATH = "model.ubj"
 FEATURES_PATH = "model_features.pkl"
 
 st.set_page_config(page_title="Box Office Predictor", page_icon="🎬", layout="centered")
 
 @st.cache_resource
 def load_model():
-    return joblib.load(MODEL_PATH), joblib.load(FEATURES_PATH)
+    # Native XGBoost format: no sklearn wrapper to unpickle
+    booster = xgb.Booster()
+    booster.load_model(MODEL_PATH)
+    feature_cols = joblib.load(FEATURES_PATH)
+    # Column name -> position, so predictions can fill a plain numpy vector
+    feat_to_idx = {col: i for i, col in enumerate(feature_cols)}
+    # Early-stopped models carry best_iteration; predict only up to it so the
+    # app matches the evaluation in 05_modeling.py. (0, 0) means every tree,
+    # for older models saved without early stopping.
+    best_iteration = getattr(booster, "best_iteration", None)
+    iteration_range = (0, best_iteration + 1) if best_iteration is not None else (0, 0)
+    return booster, feature_cols, feat_to_idx, iteration_range
 
 try:
-    model, feature_cols = load_model()
+    booster, feature_cols, feat_to_idx, iteration_range = load_model()
 except Exception as e:
     st.error(f"Error loading model: {e}. Did you run 05_modeling.py first?")
     st.stop()
 
+# UI label -> the exact one-hot column name produced by 03_feature_engineering.py,
+# resolved to a vector index once at startup instead of per click
+SEASON_IDX = {
+    label: feat_to_idx[col]
+    for label, col in {
+        "Summer Blockbuster": "season_Summer_Blockbuster",
+        "Holiday Season": "season_Holiday_Season",
+        "Spring Fall": "season_Spring_Fall",
+        "Dump Months": "season_Dump_Months",
+    }.items()
+    if col in feat_to_idx
+}
+
+GENRE_IDX = {
+    genre: feat_to_idx[f"genre_{genre}"]
+    for genre in ["Action", "Adventure", "Animation", "Comedy", "Drama", "Science Fiction", "Horror", "Thriller"]
+    if f"genre_{genre}" in feat_to_idx
+}
+
 st.title("🎬 Movie Box Office Predictor")
 st.markdown("Enter the details of a hypothetical movie to see how much money our model predicts it will make globally!")
 
@@ -51,30 +81,26 @@ with col2:
 if st.button("Predict Box Office Revenue 💸"):
     with st.spinner('Calculating Hollywood Magic...'):
         
-        # 1. Create dictionary of all zeros for features
-        input_data = {col: 0 for col in feature_cols}
-        
+        # 1. Start from a zeroed feature vector in the model's column order
+        x = np.zeros((1, len(feature_cols)), dtype=np.float32)
+
         # 2. Populate numerical values
-        input_data['budget_adj'] = budget * 1_000_000
-        input_data['runtime'] = runtime
-        input_data['is_franchise'] = 1 if is_franchise else 0
-        input_data['director_score'] = director_score
-        input_data['actor_score'] = actor_score
-        
+        x[0, feat_to_idx['budget_adj']] = budget * 1_000_000
+        x[0, feat_to_idx['runtime']] = runtime
+        x[0, feat_to_idx['is_franchise']] = 1 if is_franchise else 0
+        x[0, feat_to_idx['director_score']] = director_score
+        x[0, feat_to_idx['actor_score']] = actor_score
+
         # 3. Populate one-hot encoded categorical values
-        season_col = f"season_{season}"
-        if season_col in input_data:
-            input_data[season_col] = 1
-            
-        genre_col = f"genre_{primary_genre}"
-        if genre_col in input_data:
-            input_data[genre_col] = 1
-            
-        # 4. Convert to DataFrame and predict
-        input_df = pd.DataFrame([input_data])
-        
+        if season in SEASON_IDX:
+            x[0, SEASON_IDX[season]] = 1
+
+        if primary_genre in GENRE_IDX:
+            x[0, GENRE_IDX[primary_genre]] = 1
+
+        # 4. Predict straight from the numpy vector (no DataFrame or DMatrix build)
         #  Model predicts the log of revenue, so it must be exponentiated
-        log_pred = model.predict(input_df)[0]
+        log_pred = booster.inplace_predict(x, iteration_range=iteration_range)[0]
         actual_dollars = np.expm1(log_pred)
         
         # Output
@@ -1,6 +1,8 @@
-import subprocess
 import sys
 import os
+import asyncio
+import inspect
+import importlib.util
 
 # --- Path configuration ---
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
@@ -15,31 +17,54 @@ PIPELINE = [
     "05_modeling.py"
 ]
 
+def load_script(script_path):
+    """
+    Imports a pipeline script as a module. The filenames start with digits,
+    so they are loaded by path instead of a normal import statement.
+    """
+    module_name = "pipeline_" + os.path.splitext(os.path.basename(script_path))[0]
+    spec = importlib.util.spec_from_file_location(module_name, script_path)
+    module = importlib.util.module_from_spec(spec)
+    # Register the module so pickle can re-import it by name; without this,
+    # 04_eda's worker processes can't unpickle its module-level render functions
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
 def main():
     print("Starting box office prediction pipeline...")
     print("=" * 50)
-    
+
     for script_name in PIPELINE:
         script_path = os.path.join(SCRIPTS_DIR, script_name)
-        
+
         if not os.path.exists(script_path):
             print(f"Error: Could not find {script_name} in {SCRIPTS_DIR}")
             sys.exit(1)
-            
+
         print(f"\nRunning {script_name}...")
-        
-        # Execute script and wait for it to finish
-        result = subprocess.run([sys.executable, script_path])
-        
-        # Fail-safe: If the script crashed, stop whole pipeline
-        if result.returncode != 0:
-            print(f"\nPipeline failed during {script_name}. Stopping execution.")
+
+        # Run each stage in this interpreter, so pandas/sklearn/xgboost are
+        # only imported once instead of re-imported by a fresh subprocess
+        try:
+            module = load_script(script_path)
+            if inspect.iscoroutinefunction(module.main):
+                asyncio.run(module.main())
+            else:
+                module.main()
+        except SystemExit as e:
+            if e.code not in (0, None):
+                print(f"\nPipeline failed during {script_name}. Stopping execution.")
+                sys.exit(1)
+        except Exception as e:
+            # Fail-safe: If the script crashed, stop whole pipeline
+            print(f"\nPipeline failed during {script_name}: {e}")
             sys.exit(1)
-            
+
     print("\n" + "=" * 50)
     print("Pipeline executed successfully.")
     print("Check the 'visualizations' folder for new charts.")
     print("Run 'streamlit run app.py' to test the final model.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
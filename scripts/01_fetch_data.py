@@ -1,118 +1,155 @@
 import os
-import time
-import requests
+import glob
+import asyncio
+import aiohttp
 import pandas as pd
 from tqdm import tqdm
 from dotenv import load_dotenv
-import json
 
 # --- Path configuration ---
 load_dotenv()
 API_KEY = os.getenv("TMDB_API_KEY")
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 OUTPUT_DIR = os.path.join(PROJECT_ROOT, "data", "raw")
-OUTPUT_FILE = os.path.join(OUTPUT_DIR, "tmdb_movies_raw.csv")
+SHARD_DIR = os.path.join(OUTPUT_DIR, "shards")
+OUTPUT_FILE = os.path.join(OUTPUT_DIR, "tmdb_movies_raw.parquet")
 
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+# How many requests are allowed in flight at once across ALL years
+# (stays under TMDB's ~50 req/s rate limit), and how many TCP connections
+# the shared session may pool
+CONCURRENT_REQUESTS = 40
+CONNECTION_LIMIT = 20
+
+os.makedirs(SHARD_DIR, exist_ok=True)
 
 if not API_KEY:
     raise ValueError("API Key not found. Please check your .env file.")
 
-def fetch_detailed_movies_by_year(year, pages_to_fetch=10):
+async def fetch_json(session, url, params, semaphore):
+    """GETs a TMDB endpoint, backing off and retrying if rate limited (429)."""
+    async with semaphore:
+        while True:
+            async with session.get(url, params=params) as res:
+                if res.status == 429:
+                    # TMDB tells us how long to wait before trying again
+                    retry_after = float(res.headers.get("Retry-After", 1))
+                    await asyncio.sleep(retry_after)
+                    continue
+                if res.status != 200:
+                    return None
+                return await res.json()
+
+async def fetch_movie_details(session, movie_id, semaphore):
+    """Fetches financial data + CAST/CREW + FRANCHISE data for one movie."""
+    details_url = f"https://api.themoviedb.org/3/movie/{movie_id}"
+    detail_params = {
+        "api_key": API_KEY,
+        "language": "en-US",
+        "append_to_response": "credits"
+    }
+
+    data = await fetch_json(session, details_url, detail_params, semaphore)
+    if data is None:
+        return None
+
+    # Only extract what is needed to keep the dataset from becoming too large
+    return {
+        "id": data.get("id"),
+        "title": data.get("title"),
+        "release_date": data.get("release_date"),
+        "budget": data.get("budget"),
+        "revenue": data.get("revenue"),
+        "runtime": data.get("runtime"),
+        "popularity": data.get("popularity"),
+        "vote_average": data.get("vote_average"),
+        "vote_count": data.get("vote_count"),
+        "original_language": data.get("original_language"),
+
+        # Parquet keeps these nested structures natively, no JSON strings needed
+        "genres": data.get("genres", []),
+        "belongs_to_collection": data.get("belongs_to_collection"),
+        "cast": data.get("credits", {}).get("cast", []),
+        "crew": data.get("credits", {}).get("crew", [])
+    }
+
+async def fetch_detailed_movies_by_year(session, year, semaphore, pages_to_fetch=10):
     """
-    1: Discover top movies for the year.
-    2: Fetch financial data + CAST/CREW + FRANCHISE data.
+    1: Discover top movies for the year (all pages fetched concurrently).
+    2: Fetch details for every discovered movie, overlapped under the semaphore.
     """
     discover_url = "https://api.themoviedb.org/3/discover/movie"
-    details_url = "https://api.themoviedb.org/3/movie/{}"
-    
-    detailed_movies = []
-    
-    for page in tqdm(range(1, pages_to_fetch + 1), desc=f"Year {year}"):
-        discover_params = {
-            "api_key": API_KEY,
-            "language": "en-US",
-            "sort_by": "popularity.desc",
-            "primary_release_year": year,
-            "page": page,
-            "with_release_type": "3|2", # Theatrical releases
-            "region": "US"
-        }
-        
-        try:
-            # 1. Get the list of movies
-            res = requests.get(discover_url, params=discover_params)
-            if res.status_code != 200:
-                time.sleep(2)
-                continue
-                
-            results = res.json().get("results", [])
-            
-            # 2. Get the financial + credits details for each movie
-            for movie in results:
-                movie_id = movie["id"]
-                
-                detail_params = {
-                    "api_key": API_KEY, 
-                    "language": "en-US",
-                    "append_to_response": "credits" 
-                }
-                
-                detail_res = requests.get(details_url.format(movie_id), params=detail_params)
-                
-                if detail_res.status_code == 200:
-                    data = detail_res.json()
-                    
-                    # To keep CSV from becoming too large, only extract what is needed
-                    movie_dict = {
-                        "id": data.get("id"),
-                        "title": data.get("title"),
-                        "release_date": data.get("release_date"),
-                        "budget": data.get("budget"),
-                        "revenue": data.get("revenue"),
-                        "runtime": data.get("runtime"),
-                        "popularity": data.get("popularity"),
-                        "vote_average": data.get("vote_average"),
-                        "vote_count": data.get("vote_count"),
-                        "original_language": data.get("original_language"),
-                        
-                        # Store complex JSON lists as strings to parse later
-                        "genres": json.dumps(data.get("genres", [])),
-                        "belongs_to_collection": json.dumps(data.get("belongs_to_collection")),
-                        "cast": json.dumps(data.get("credits", {}).get("cast", [])),
-                        "crew": json.dumps(data.get("credits", {}).get("crew", []))
-                    }
-                    
-                    detailed_movies.append(movie_dict)
-                
-                # TMDB rate limit respect
-                time.sleep(0.05)
-                
-        except Exception as e:
-            print(f"Error on year {year} page {page}: {e}")
-            
-    return detailed_movies
-
-def main():
+
+    try:
+        # 1. Get the lists of movies for every page at once
+        discover_tasks = [
+            fetch_json(session, discover_url, {
+                "api_key": API_KEY,
+                "language": "en-US",
+                "sort_by": "popularity.desc",
+                "primary_release_year": year,
+                "page": page,
+                "with_release_type": "3|2", # Theatrical releases
+                "region": "US"
+            }, semaphore)
+            for page in range(1, pages_to_fetch + 1)
+        ]
+        pages = await asyncio.gather(*discover_tasks)
+
+        # 2. Get the financial + credits details for each movie
+        detail_tasks = [
+            fetch_movie_details(session, movie["id"], semaphore)
+            for page_data in pages if page_data
+            for movie in page_data.get("results", [])
+        ]
+
+        results = await asyncio.gather(*detail_tasks)
+        return [movie_dict for movie_dict in results if movie_dict]
+
+    except Exception as e:
+        print(f"Error on year {year}: {e}")
+        return []
+
+async def fetch_and_checkpoint_year(session, year, semaphore):
+    """Fetches one year and writes its shard as soon as the year completes."""
+    year_data = await fetch_detailed_movies_by_year(session, year, semaphore, pages_to_fetch=10)
+
+    # Checkpoint just this year's shard; the full dataset is
+    # assembled once at the end instead of rewritten every year
+    shard_file = os.path.join(SHARD_DIR, f"tmdb_{year}.parquet")
+    pd.DataFrame(year_data).to_parquet(shard_file, engine='pyarrow', compression='snappy')
+
+    return year_data
+
+async def main():
     all_movies = []
     start_year = 2000
     end_year = 2024
-    
+
     print(f"Starting TMDB data fetch with credits & franchises ({start_year}-{end_year})")
     print("-" * 50)
 
-    for year in range(start_year, end_year + 1):
-        year_data = fetch_detailed_movies_by_year(year, pages_to_fetch=10)
-        all_movies.extend(year_data)
-        
-        # Save incremental progress
-        temp_df = pd.DataFrame(all_movies)
-        temp_df.to_csv(OUTPUT_FILE, index=False)
-        
+    semaphore = asyncio.Semaphore(CONCURRENT_REQUESTS)
+    connector = aiohttp.TCPConnector(limit=CONNECTION_LIMIT)
+
+    # One session reused across all years so connections get pooled; the
+    # shared semaphore keeps every year's requests under the rate limit
+    async with aiohttp.ClientSession(connector=connector) as session:
+        year_tasks = [
+            fetch_and_checkpoint_year(session, year, semaphore)
+            for year in range(start_year, end_year + 1)
+        ]
+        for task in tqdm(asyncio.as_completed(year_tasks), total=len(year_tasks), desc="Years"):
+            all_movies.extend(await task)
+
+    # Stitch the per-year shards into the single raw dataset
+    shard_files = sorted(glob.glob(os.path.join(SHARD_DIR, "tmdb_*.parquet")))
+    full_df = pd.concat([pd.read_parquet(p) for p in shard_files], ignore_index=True)
+    full_df.to_parquet(OUTPUT_FILE, engine='pyarrow', compression='snappy')
+
     print("-" * 50)
     print(f"Download complete.")
     print(f"Total detailed movies fetched: {len(all_movies)}")
     print(f"Saved to: {OUTPUT_FILE}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
@@ -6,8 +6,8 @@ from datetime import datetime
 
 # --- Path configuration ---
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-INPUT_FILE = os.path.join(PROJECT_ROOT, "data", "raw", "tmdb_movies_raw.csv")
-OUTPUT_FILE = os.path.join(PROJECT_ROOT, "data", "clean", "tmdb_movies_clean.csv")
+INPUT_FILE = os.path.join(PROJECT_ROOT, "data", "raw", "tmdb_movies_raw.parquet")
+OUTPUT_FILE = os.path.join(PROJECT_ROOT, "data", "clean", "tmdb_movies_clean.parquet")
 
 os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
 
@@ -26,7 +26,7 @@ def main():
         print(f"Error: Input file not found at {INPUT_FILE}")
         return
 
-    df = pd.read_csv(INPUT_FILE)
+    df = pd.read_parquet(INPUT_FILE)
     print(f"Original row count: {len(df)}")
     
     # 3. Drop duplicates
@@ -61,9 +61,14 @@ def main():
             except:
                 inflation_multipliers[y] = 1.0
                 
-    df['inflation_factor'] = df['release_year'].map(inflation_multipliers)
-    df['budget_adj'] = df['budget'] * df['inflation_factor']
-    df['revenue_adj'] = df['revenue'] * df['inflation_factor']
+    # Look the factors up through a small sorted numpy table instead of a
+    # per-row hash map, and multiply on raw arrays to skip intermediate Series
+    years_sorted = np.sort(np.array(list(inflation_multipliers), dtype=np.int64))
+    factors = np.array([inflation_multipliers[y] for y in years_sorted])
+    factor = factors[np.searchsorted(years_sorted, df['release_year'].to_numpy(dtype=np.int64))]
+
+    df['budget_adj'] = df['budget'].to_numpy() * factor
+    df['revenue_adj'] = df['revenue'].to_numpy() * factor
     
     # 6. Save
     cols_to_keep = [
@@ -77,7 +82,7 @@ def main():
     final_cols = [c for c in cols_to_keep if c in df.columns]
     df = df[final_cols]
     
-    df.to_csv(OUTPUT_FILE, index=False)
+    df.to_parquet(OUTPUT_FILE, engine='pyarrow', compression='snappy')
     print("-" * 30)
     print("Data cleaning complete.")
     print(f"Final dataset size: {len(df)} movies")
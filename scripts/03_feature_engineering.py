@@ -1,63 +1,76 @@
 import pandas as pd
+import numpy as np
 import ast
 import os
-import json
+from numba import njit
 
 # --- Path configuration ---
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-INPUT_FILE = os.path.join(PROJECT_ROOT, "data", "clean", "tmdb_movies_clean.csv")
+INPUT_FILE = os.path.join(PROJECT_ROOT, "data", "clean", "tmdb_movies_clean.parquet")
 OUTPUT_FILE = os.path.join(PROJECT_ROOT, "data", "clean", "tmdb_movies_features.csv")
 
-def get_genre_names(genre_str):
-    """Parses genre data to extract genre."""
+def parse_row(genres, crew, cast, collection):
+    """
+    Extracts (genre_list, director, top_actor, is_franchise) for one movie
+    from the nested structures stored natively in parquet.
+    """
+    genre_list = []
     try:
-        if pd.isna(genre_str): return []
-        genres = json.loads(genre_str)
-        return [g['name'] for g in genres]
+        if genres is not None:
+            genre_list = [g['name'] for g in genres]
     except:
-        return []
-
-def get_season(month):
-    """Categorizes movies based on the movie season they are released."""
-    if pd.isna(month): return 'Unknown'
-    month = int(month)
-    if month in [5, 6, 7]: return 'Summer_Blockbuster'
-    elif month in [11, 12]: return 'Holiday_Season'
-    elif month in [1, 2, 8, 9]: return 'Dump_Months'
-    else: return 'Spring_Fall'
-
-def get_director(crew_str):
-    """Parses crew JSON to find director."""
+        pass
+
+    director = "Unknown"
     try:
-        if pd.isna(crew_str): return "Unknown"
-        crew = json.loads(crew_str)
-        for member in crew:
-            if member.get('job') == 'Director':
-                return member.get('name')
-        return "Unknown"
+        if crew is not None:
+            for member in crew:
+                if member.get('job') == 'Director':
+                    director = member.get('name')
+                    break
     except:
-        return "Unknown"
+        pass
 
-def get_top_actor(cast_str):
-    """Parses cast JSON to find #1 billed actor."""
+    top_actor = "Unknown"
     try:
-        if pd.isna(cast_str): return "Unknown"
-        cast = json.loads(cast_str)
-        if len(cast) > 0:
-            return cast[0].get('name')
-        return "Unknown"
+        if cast is not None and len(cast) > 0:
+            top_actor = cast[0].get('name')
     except:
-        return "Unknown"
+        pass
 
-def is_franchise(collection_str):
-    """Checks if movie belongs to a larger franchise collection."""
+    franchise = 0
     try:
-        if pd.isna(collection_str) or collection_str == 'null': return 0
-        coll = json.loads(collection_str)
-        if coll and isinstance(coll, dict): return 1
-        return 0
+        if collection is not None and isinstance(collection, dict) and collection:
+            franchise = 1
     except:
-        return 0
+        pass
+
+    return genre_list, director, top_actor, franchise
+
+@njit
+def past_average_kernel(codes, revenue, unknown_code):
+    """
+    One native pass over the date-sorted rows: for each movie, score is the
+    average revenue of that person's PAST movies (0 for their first movie),
+    then the running sum/count is updated with the current movie.
+    """
+    n = codes.shape[0]
+    n_groups = codes.max() + 1
+    scores = np.zeros(n)
+    sum_rev = np.zeros(n_groups)
+    count = np.zeros(n_groups, np.int64)
+
+    for i in range(n):
+        g = codes[i]
+        # "Unknown" is a catch-all, not a real person, so it gets no track record
+        if g < 0 or g == unknown_code:
+            continue
+        if count[g] > 0:
+            scores[i] = sum_rev[g] / count[g]
+        sum_rev[g] += revenue[i]
+        count[g] += 1
+
+    return scores
 
 def main():
     print("Starting feature engineering...")
@@ -66,77 +79,64 @@ def main():
         print(f"Error: {INPUT_FILE} not found.")
         return
         
-    df = pd.read_csv(INPUT_FILE)
-    
-    # 1. Genres & Seasons
+    df = pd.read_parquet(INPUT_FILE)
+
+    # 1. Parse the nested columns (genres, crew, cast, franchise) in one sweep
+    print("Parsing genres, franchises, and talent...")
+    parsed = list(map(parse_row, df['genres'], df['crew'], df['cast'], df['belongs_to_collection']))
+    genre_lists, directors, top_actors, franchise_flags = zip(*parsed)
+
+    df['genre_list'] = list(genre_lists)
+    df['director'] = list(directors)
+    df['top_actor'] = list(top_actors)
+    df['is_franchise'] = list(franchise_flags)
+
+    # The nested source columns are dead weight from here on; drop them now
+    # so the sort/groupby below work on a much smaller frame
+    df.drop(columns=['genres', 'crew', 'cast', 'belongs_to_collection'], inplace=True)
+
+    # 2. Genre & Season dummies
     print("Processing genres & seasons...")
-    df['genre_list'] = df['genres'].apply(get_genre_names)
-    genre_dummies = df['genre_list'].str.join('|').str.get_dummies()
+    # int8 is all a 0/1 flag needs; int64 would be 8x the memory
+    genre_dummies = df['genre_list'].str.join('|').str.get_dummies().astype(np.int8)
     genre_dummies = genre_dummies.add_prefix('genre_')
-    df = pd.concat([df, genre_dummies], axis=1)
-    
-    df['season'] = df['release_month'].apply(get_season)
-    season_dummies = pd.get_dummies(df['season'], prefix='season').astype(int)
-    df = pd.concat([df, season_dummies], axis=1)
-
-    # 2. Franchise Flag
-    print("Tagging franchises...")
-    df['is_franchise'] = df['belongs_to_collection'].apply(is_franchise)
+    # Assign columns directly instead of pd.concat, which copies the whole frame
+    df[genre_dummies.columns] = genre_dummies.values
+    df.drop(columns=['genre_list'], inplace=True)
 
-    # 3. Extract talent
-    print("Extracting directors and top cast...")
-    df['director'] = df['crew'].apply(get_director)
-    df['top_actor'] = df['cast'].apply(get_top_actor)
+    # Categorize the release season with vectorized month checks
+    m = df['release_month']
+    df['season'] = np.select(
+        [m.isna(), m.isin([5, 6, 7]), m.isin([11, 12]), m.isin([1, 2, 8, 9])],
+        ['Unknown', 'Summer_Blockbuster', 'Holiday_Season', 'Dump_Months'],
+        default='Spring_Fall'
+    )
+    season_dummies = pd.get_dummies(df['season'], prefix='season', dtype=np.int8)
+    df[season_dummies.columns] = season_dummies.values
 
-    # 4. Prevent data leakage by using rolling historical averages
+    # 3. Prevent data leakage by using rolling historical averages
     print("Calculating historical star power (rolling averages)...")
     # Must sort by date first, so that only past data is used
     df = df.sort_values('release_date').reset_index(drop=True)
-    
-    director_rev, director_count = {}, {}
-    actor_rev, actor_count = {}, {}
-    dir_scores, actor_scores = [], []
-    
-    for idx, row in df.iterrows():
-        d = row['director']
-        a = row['top_actor']
-        rev = row['revenue_adj']
-        
-        # Director score
-        if d != "Unknown" and d in director_rev:
-            # Average of all past movies
-            dir_scores.append(director_rev[d] / director_count[d])
-            director_rev[d] += rev
-            director_count[d] += 1
-        else:
-            dir_scores.append(0) # First time this director is seen, score is 0
-            if d != "Unknown":
-                director_rev[d] = rev
-                director_count[d] = 1
-                
-        # Actor score
-        if a != "Unknown" and a in actor_rev:
-            actor_scores.append(actor_rev[a] / actor_count[a])
-            actor_rev[a] += rev
-            actor_count[a] += 1
-        else:
-            actor_scores.append(0)
-            if a != "Unknown":
-                actor_rev[a] = rev
-                actor_count[a] = 1
+
+    revenue = df['revenue_adj'].to_numpy(dtype=np.float64)
+
+    def rolling_past_average(group_col):
+        """Mean of each person's PAST movies only; 0 for their first movie."""
+        # Integer-encode the names so the JIT kernel works on plain int64 arrays
+        codes, names = pd.factorize(df[group_col])
+        unknown_code = names.get_loc("Unknown") if "Unknown" in names else -1
+        return past_average_kernel(codes.astype(np.int64), revenue, unknown_code)
 
     # Convert to millions for the model to digest easily
-    df['director_score'] = pd.Series(dir_scores) / 1_000_000
-    df['actor_score'] = pd.Series(actor_scores) / 1_000_000
-
-    # 5. Clean up
-    cols_to_drop = [
-        'genres', 'genre_list', 'release_date', 'belongs_to_collection', 
-        'cast', 'crew', 'director', 'top_actor'
-    ]
+    df['director_score'] = rolling_past_average('director') / 1_000_000
+    df['actor_score'] = rolling_past_average('top_actor') / 1_000_000
+
+    # 4. Clean up
+    cols_to_drop = ['release_date', 'director', 'top_actor']
     df = df.drop(columns=[c for c in cols_to_drop if c in df.columns])
     
-    # 6. Save
+    # 5. Save
     df.to_csv(OUTPUT_FILE, index=False)
     print("-" * 30)
     print("Feature engineering complete.")
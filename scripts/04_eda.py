@@ -2,127 +2,158 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+from concurrent.futures import ProcessPoolExecutor
 
 # --- Path configuration ---
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 INPUT_FILE = os.path.join(PROJECT_ROOT, "data", "clean", "tmdb_movies_features.csv")
 VIZ_DIR = os.path.join(PROJECT_ROOT, "visualizations")
 
+# 150 is plenty for on-screen viewing; 300 quadruples the pixels to rasterize
+DPI = 150
+
 os.makedirs(VIZ_DIR, exist_ok=True)
 
-def main():
-    print("Starting Exploratory Data Analysis...")
-    
-    if not os.path.exists(INPUT_FILE):
-        print(f"Error: {INPUT_FILE} not found.")
-        return
-        
-    df = pd.read_csv(INPUT_FILE)
-    sns.set_theme(style="whitegrid")
-    
+# Applied at import so worker processes pick the theme up too
+sns.set_theme(style="whitegrid")
+
+def needs_rebuild(out_path):
+    """True if the chart is missing or older than the features file."""
+    return (not os.path.exists(out_path)) or os.path.getmtime(out_path) < os.path.getmtime(INPUT_FILE)
+
+def render_revenue_distribution(df):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.histplot(df['revenue_adj'] / 1_000_000, bins=50, kde=True, color='forestgreen', ax=ax)
+    ax.set_title('Distribution of Global Box Office Revenue (Adjusted)', fontsize=16)
+    ax.set_xlabel('Global Revenue (Millions, 2024 US Dollars)')
+    ax.set_xlim(0, 1500)
+    fig.tight_layout()
+    fig.savefig(os.path.join(VIZ_DIR, "01_revenue_distribution.png"), dpi=DPI)
+    plt.close(fig)
+
+def render_budget_vs_revenue(df):
     revenue_m = df['revenue_adj'] / 1_000_000
     budget_m = df['budget_adj'] / 1_000_000
 
-    # Charts 1 & 2: Distributions & ROI
-    print("Generating charts for distribution & ROI...")
-    plt.figure(figsize=(10, 6))
-    sns.histplot(revenue_m, bins=50, kde=True, color='forestgreen')
-    plt.title('Distribution of Global Box Office Revenue (Adjusted)', fontsize=16)
-    plt.xlabel('Global Revenue (Millions, 2024 US Dollars)')
-    plt.xlim(0, 1500)
-    plt.tight_layout()
-    plt.savefig(os.path.join(VIZ_DIR, "01_revenue_distribution.png"), dpi=300)
-    plt.close()
-
-    plt.figure(figsize=(10, 6))
-    sns.scatterplot(x=budget_m, y=revenue_m, alpha=0.5, color='royalblue')
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.scatterplot(x=budget_m, y=revenue_m, alpha=0.5, color='royalblue', ax=ax)
     max_val = min(budget_m.max(), 400)
-    plt.plot([0, max_val], [0, max_val * 2], color='red', linestyle='--', label='Break-Even (2x Budget)')
-    plt.title('Adjusted Budget vs. Adjusted Global Revenue', fontsize=16)
-    plt.xlabel('Budget (Millions, 2024 US Dollars)')
-    plt.ylabel('Global Revenue (Millions, 2024 US Dollars)')
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig(os.path.join(VIZ_DIR, "02_budget_vs_revenue.png"), dpi=300)
-    plt.close()
-
-    # Chart 3: Correlation Heatmap
-    print("Generating correlation heatmap...")
-    plt.figure(figsize=(10, 8))
+    ax.plot([0, max_val], [0, max_val * 2], color='red', linestyle='--', label='Break-Even (2x Budget)')
+    ax.set_title('Adjusted Budget vs. Adjusted Global Revenue', fontsize=16)
+    ax.set_xlabel('Budget (Millions, 2024 US Dollars)')
+    ax.set_ylabel('Global Revenue (Millions, 2024 US Dollars)')
+    ax.legend()
+    fig.tight_layout()
+    fig.savefig(os.path.join(VIZ_DIR, "02_budget_vs_revenue.png"), dpi=DPI)
+    plt.close(fig)
+
+def render_correlation_heatmap(df):
     cols_for_corr = [
-        'budget_adj', 'revenue_adj', 'runtime', 
+        'budget_adj', 'revenue_adj', 'runtime',
         'is_franchise', 'director_score', 'actor_score'
     ]
     # Only keep columns that actually exist in the dataframe
     cols_for_corr = [c for c in cols_for_corr if c in df.columns]
-    
     corr_matrix = df[cols_for_corr].corr()
-    sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', fmt=".2f", linewidths=0.5, vmin=-1, vmax=1)
-    plt.title('Feature Correlation Heatmap', fontsize=16)
-    plt.tight_layout()
-    plt.savefig(os.path.join(VIZ_DIR, "03_correlation_heatmap.png"), dpi=300)
-    plt.close()
-
-    # Chart 4: Seasonality
-    if 'season' in df.columns:
-        print("Generating seasonality boxplot...")
-        plt.figure(figsize=(10, 6))
-        sns.boxplot(x=df['season'], y=revenue_m, hue=df['season'], order=['Summer_Blockbuster', 'Holiday_Season', 'Spring_Fall', 'Dump_Months'], palette="Set2", legend=False)
-        plt.title('Adjusted Global Revenue by Release Season', fontsize=16)
-        plt.ylabel('Global Revenue (Millions, 2024 US Dollars)')
-        plt.xlabel('Release Season')
-        plt.ylim(0, 1000)
-        plt.tight_layout()
-        plt.savefig(os.path.join(VIZ_DIR, "04_seasonality_boxplot.png"), dpi=300)
-        plt.close()
-
-    # Chart 5: Runtime
-    if 'runtime' in df.columns:
-        print("Generating runtime vs. revenue scatterplot...")
-        plt.figure(figsize=(10, 6))
-        valid_runtime = df[(df['runtime'] > 60) & (df['runtime'] < 240)]
-        sns.scatterplot(x=valid_runtime['runtime'], y=valid_runtime['revenue_adj'] / 1_000_000, alpha=0.5, color='purple')
-        plt.title('Movie Runtime vs. Adjusted Global Revenue', fontsize=16)
-        plt.xlabel('Runtime (Minutes)')
-        plt.ylabel('Global Revenue (Millions, 2024 US Dollars)')
-        plt.tight_layout()
-        plt.savefig(os.path.join(VIZ_DIR, "05_runtime_vs_revenue.png"), dpi=300)
-        plt.close()
-
-    # Chart 6: Franchise Premium
-    if 'is_franchise' in df.columns:
-        print("Generating franchise boxplot...")
-        plt.figure(figsize=(8, 6))
-        df['Franchise_Label'] = df['is_franchise'].map({1: 'Franchise / Sequel', 0: 'Original / Standalone'})
-        sns.boxplot(x=df['Franchise_Label'], y=revenue_m, hue=df['Franchise_Label'], palette="Set1", legend=False)
-        plt.title('The Franchise Premium: Adjusted Global Revenue Comparison', fontsize=16)
-        plt.ylabel('Global Revenue (Millions, 2024 US Dollars)')
-        plt.xlabel('')
-        plt.ylim(0, 1500)
-        plt.tight_layout()
-        plt.savefig(os.path.join(VIZ_DIR, "06_franchise_premium.png"), dpi=300)
-        plt.close()
-
-    # Chart 7: Director Track Record
-    if 'director_score' in df.columns:
-        print("Generating director track record scatter...")
-        plt.figure(figsize=(10, 6))
-        # Remove directors with 0 score (first time directors) so they don't crowd the y-axis
-        established_directors = df[df['director_score'] > 0]
-        sns.scatterplot(x=established_directors['director_score'], y=established_directors['revenue_adj'] / 1_000_000, alpha=0.5, color='darkorange')
-        
-        # Add a trendline
-        sns.regplot(x=established_directors['director_score'], y=established_directors['revenue_adj'] / 1_000_000, scatter=False, color='black', line_kws={"linestyle": "--"})
-        
-        plt.title('Director Track Record vs. Adjusted Global Revenue', fontsize=16)
-        plt.xlabel('Director Rolling Average Revenue Prior to Release (Millions, US Dollars)')
-        plt.ylabel('Global Revenue (Millions, 2024 US Dollars)')
-        plt.tight_layout()
-        plt.savefig(os.path.join(VIZ_DIR, "07_director_track_record.png"), dpi=300)
-        plt.close()
+
+    fig, ax = plt.subplots(figsize=(10, 8))
+    sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', fmt=".2f", linewidths=0.5, vmin=-1, vmax=1, ax=ax)
+    ax.set_title('Feature Correlation Heatmap', fontsize=16)
+    fig.tight_layout()
+    fig.savefig(os.path.join(VIZ_DIR, "03_correlation_heatmap.png"), dpi=DPI)
+    plt.close(fig)
+
+def render_seasonality_boxplot(df):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.boxplot(x=df['season'], y=df['revenue_adj'] / 1_000_000, hue=df['season'], order=['Summer_Blockbuster', 'Holiday_Season', 'Spring_Fall', 'Dump_Months'], palette="Set2", legend=False, ax=ax)
+    ax.set_title('Adjusted Global Revenue by Release Season', fontsize=16)
+    ax.set_ylabel('Global Revenue (Millions, 2024 US Dollars)')
+    ax.set_xlabel('Release Season')
+    ax.set_ylim(0, 1000)
+    fig.tight_layout()
+    fig.savefig(os.path.join(VIZ_DIR, "04_seasonality_boxplot.png"), dpi=DPI)
+    plt.close(fig)
+
+def render_runtime_vs_revenue(df):
+    valid_runtime = df[(df['runtime'] > 60) & (df['runtime'] < 240)]
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.scatterplot(x=valid_runtime['runtime'], y=valid_runtime['revenue_adj'] / 1_000_000, alpha=0.5, color='purple', ax=ax)
+    ax.set_title('Movie Runtime vs. Adjusted Global Revenue', fontsize=16)
+    ax.set_xlabel('Runtime (Minutes)')
+    ax.set_ylabel('Global Revenue (Millions, 2024 US Dollars)')
+    fig.tight_layout()
+    fig.savefig(os.path.join(VIZ_DIR, "05_runtime_vs_revenue.png"), dpi=DPI)
+    plt.close(fig)
+
+def render_franchise_premium(df):
+    franchise_label = df['is_franchise'].map({1: 'Franchise / Sequel', 0: 'Original / Standalone'})
+
+    fig, ax = plt.subplots(figsize=(8, 6))
+    sns.boxplot(x=franchise_label, y=df['revenue_adj'] / 1_000_000, hue=franchise_label, palette="Set1", legend=False, ax=ax)
+    ax.set_title('The Franchise Premium: Adjusted Global Revenue Comparison', fontsize=16)
+    ax.set_ylabel('Global Revenue (Millions, 2024 US Dollars)')
+    ax.set_xlabel('')
+    ax.set_ylim(0, 1500)
+    fig.tight_layout()
+    fig.savefig(os.path.join(VIZ_DIR, "06_franchise_premium.png"), dpi=DPI)
+    plt.close(fig)
+
+def render_director_track_record(df):
+    # Remove directors with 0 score (first time directors) so they don't crowd the y-axis
+    established_directors = df[df['director_score'] > 0]
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    sns.scatterplot(x=established_directors['director_score'], y=established_directors['revenue_adj'] / 1_000_000, alpha=0.5, color='darkorange', ax=ax)
+
+    # Add a trendline
+    sns.regplot(x=established_directors['director_score'], y=established_directors['revenue_adj'] / 1_000_000, scatter=False, color='black', line_kws={"linestyle": "--"}, ax=ax)
+
+    ax.set_title('Director Track Record vs. Adjusted Global Revenue', fontsize=16)
+    ax.set_xlabel('Director Rolling Average Revenue Prior to Release (Millions, US Dollars)')
+    ax.set_ylabel('Global Revenue (Millions, 2024 US Dollars)')
+    fig.tight_layout()
+    fig.savefig(os.path.join(VIZ_DIR, "07_director_track_record.png"), dpi=DPI)
+    plt.close(fig)
+
+# (render function, output file, column it depends on)
+CHARTS = [
+    (render_revenue_distribution, "01_revenue_distribution.png", None),
+    (render_budget_vs_revenue, "02_budget_vs_revenue.png", None),
+    (render_correlation_heatmap, "03_correlation_heatmap.png", None),
+    (render_seasonality_boxplot, "04_seasonality_boxplot.png", 'season'),
+    (render_runtime_vs_revenue, "05_runtime_vs_revenue.png", 'runtime'),
+    (render_franchise_premium, "06_franchise_premium.png", 'is_franchise'),
+    (render_director_track_record, "07_director_track_record.png", 'director_score'),
+]
+
+def main():
+    print("Starting Exploratory Data Analysis...")
+
+    if not os.path.exists(INPUT_FILE):
+        print(f"Error: {INPUT_FILE} not found.")
+        return
+
+    df = pd.read_csv(INPUT_FILE)
+
+    to_render = [
+        render_fn for render_fn, filename, required_col in CHARTS
+        if (required_col is None or required_col in df.columns)
+        and needs_rebuild(os.path.join(VIZ_DIR, filename))
+    ]
+
+    if to_render:
+        print(f"Rendering {len(to_render)} charts...")
+        # matplotlib isn't thread-safe, so stale charts render in parallel worker processes
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(render_fn, df) for render_fn in to_render]
+            for future in futures:
+                future.result()
+    else:
+        print("All charts are up to date.")
 
     print("-" * 30)
     print(f"EDA complete. Check the '{VIZ_DIR}' folder.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()